@@ -2,15 +2,70 @@
 Definition of the Config class
 """
 
-from datetime import datetime, timedelta, timezone
+import copy
+import os
+import time
 from http import HTTPStatus
 
-import yaml
-from cerberus import Validator, schema_registry  # type: ignore
-from yaml import YAMLError
-
 from duologsync.program import Program
 
+# yaml, cerberus and the optional fastjsonschema are only imported once a
+# config file is actually read, keeping them out of the import of this module
+# for code that only uses the getters
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def _check_not_boolean(field, value, error):
+    """
+    Cerberus check_with rule rejecting booleans, which cerberus otherwise
+    accepts as integers
+    """
+
+    if isinstance(value, bool):
+        error(field, 'must not be a boolean')
+
+
+class _ConfigData:
+    """
+    Fixed-shape holder for the config values read by the Config getters, so
+    that each getter is a single slot load instead of a dictionary lookup.
+    Slots for values missing from the config are left unset.
+    """
+
+    # Path of keys within a config dictionary for each slot
+    FIELD_PATHS = {
+        'config_file_path': ('config_file_path',),
+        'log_filepath': ('dls_settings', 'log_filepath'),
+        'log_format': ('dls_settings', 'log_format'),
+        'api_offset': ('dls_settings', 'api', 'offset'),
+        'api_timeout': ('dls_settings', 'api', 'timeout'),
+        'checkpointing_enabled': ('dls_settings', 'checkpointing', 'enabled'),
+        'checkpoint_dir': ('dls_settings', 'checkpointing', 'directory'),
+        'servers': ('servers',),
+        'account_ikey': ('account', 'ikey'),
+        'account_skey': ('account', 'skey'),
+        'account_hostname': ('account', 'hostname'),
+        'account_endpoint_server_mappings': (
+            'account', 'endpoint_server_mappings'),
+        'account_block_list': ('account', 'block_list'),
+        'account_is_msp': ('account', 'is_msp'),
+        'proxy_server': ('dls_settings', 'proxy', 'proxy_server'),
+        'proxy_port': ('dls_settings', 'proxy', 'proxy_port')
+    }
+
+    __slots__ = tuple(FIELD_PATHS)
+
+    def __init__(self, flat_config):
+        """
+        @param flat_config  Dictionary of key tuples to values, as built by
+                            Config._flatten_config
+        """
+
+        for name, keys in self.FIELD_PATHS.items():
+            if keys in flat_config:
+                setattr(self, name, flat_config[keys])
+
 
 class Config:
     """
@@ -35,6 +90,11 @@ class Config:
     TRUST_MONITOR = 'trustmonitor'
     ACTIVITY = 'activity'
 
+    # Every log type a server mapping may list. A frozenset so that Cerberus'
+    # 'allowed' membership checks are hash lookups; it has no ordering
+    VALID_ENDPOINTS = frozenset((ADMIN, AUTH, TELEPHONY, TRUST_MONITOR,
+                                 ACTIVITY))
+
     DIRECTORY_DEFAULT = '/tmp'
     LOG_FILEPATH_DEFAULT = DIRECTORY_DEFAULT + '/' + 'duologsync.log'
     LOG_FORMAT_DEFAULT = 'JSON'
@@ -45,6 +105,9 @@ class Config:
     PROXY_SERVER_DEFAULT = ''
     PROXY_PORT_DEFAULT = 0
 
+    # Buffer size used when reading the config file, in bytes
+    CONFIG_READ_BUFFER_SIZE = 64 * 1024
+
     GRACEFUL_RETRY_STATUS_CODES = (HTTPStatus.TOO_MANY_REQUESTS.value,)
 
     # To understand these schema definitions better, compare side-by-side to
@@ -121,31 +184,31 @@ class Config:
         }
     }
 
-    # Schema for a server inside of servers list
-    schema_registry.add(
-        'server',
-        {
-            'id': {'type': 'string', 'required': True, 'empty': False},
-            'hostname': {'type': 'string', 'required': True, 'empty': False},
-            'port': {
-                'type': 'integer',
-                'required': True,
-                'min': 0,
-                'max': 65535
-            },
-            'protocol': {
-                'type': 'string',
-                'required': True,
-                'oneof': [
-                    {
-                        'allowed': ['TCPSSL'],
-                        'dependencies': ['cert_filepath']
-                    },
-                    {'allowed': ['TCP', 'UDP']}
-                ]
-            },
-            'cert_filepath': {'type': 'string', 'empty': False}
-        })
+    # Schema for a server inside of servers list, registered with cerberus as
+    # 'server'
+    SERVER = {
+        'id': {'type': 'string', 'required': True, 'empty': False},
+        'hostname': {'type': 'string', 'required': True, 'empty': False},
+        'port': {
+            'type': 'integer',
+            'required': True,
+            'check_with': _check_not_boolean,
+            'min': 0,
+            'max': 65535
+        },
+        'protocol': {
+            'type': 'string',
+            'required': True,
+            'oneof': [
+                {
+                    'allowed': ['TCPSSL'],
+                    'dependencies': ['cert_filepath']
+                },
+                {'allowed': ['TCP', 'UDP']}
+            ]
+        },
+        'cert_filepath': {'type': 'string', 'empty': False}
+    }
 
     # List of servers and how DLS will communicate with them
     SERVERS = {
@@ -155,23 +218,21 @@ class Config:
         'schema': {'type': 'dict', 'schema': 'server'}
     }
 
-    # Describe which servers the logs of certain endpoints should be sent to
-    schema_registry.add(
-        'endpoint_server_mapping',
-        {
-            'server': {
-                'type': 'string',
-                'empty': False,
-                'required': True
-            },
-            'endpoints': {
-                'type': 'list',
-                'empty': False,
-                'required': True,
-                'allowed': [ADMIN, AUTH, TELEPHONY, TRUST_MONITOR, ACTIVITY]
-            }
+    # Describe which servers the logs of certain endpoints should be sent to,
+    # registered with cerberus as 'endpoint_server_mapping'
+    ENDPOINT_SERVER_MAPPING = {
+        'server': {
+            'type': 'string',
+            'empty': False,
+            'required': True
+        },
+        'endpoints': {
+            'type': 'list',
+            'empty': False,
+            'required': True,
+            'allowed': VALID_ENDPOINTS
         }
-    )
+    }
 
     # Account definition, which is used to access Duo logs and tell DLS which
     # logs to fetch and to which servers those logs should be sent
@@ -193,6 +254,9 @@ class Config:
         }
     }
 
+    # Fields that must appear at the top level of every config
+    REQUIRED_FIELDS = ('version', 'servers', 'account')
+
     # Schema for validating the structure of a config dictionary generated from
     # a user-provided YAML file
     SCHEMA = {
@@ -202,8 +266,158 @@ class Config:
         'account': ACCOUNT
     }
 
-    # Generate a Validator object with the given schema
-    SCHEMA_VALIDATOR = Validator(SCHEMA)
+    # JSON Schema (draft-07) equivalent of SCHEMA. JSON Schema defaults are
+    # only applied one level deep, so each optional dictionary carries its
+    # fully populated default
+    _NON_EMPTY_STRING = {'type': 'string', 'minLength': 1}
+
+    API_DEFAULT = {
+        'offset': API_OFFSET_DEFAULT,
+        'timeout': API_TIMEOUT_DEFAULT
+    }
+    CHECKPOINTING_DEFAULT = {
+        'enabled': CHECKPOINTING_ENABLED_DEFAULT,
+        'directory': CHECKPOINTING_DIRECTORY_DEFAULT
+    }
+    PROXY_DEFAULT = {
+        'proxy_server': PROXY_SERVER_DEFAULT,
+        'proxy_port': PROXY_PORT_DEFAULT
+    }
+    DLS_SETTINGS_DEFAULT = {
+        'log_filepath': LOG_FILEPATH_DEFAULT,
+        'log_format': LOG_FORMAT_DEFAULT,
+        'api': API_DEFAULT,
+        'checkpointing': CHECKPOINTING_DEFAULT,
+        'proxy': PROXY_DEFAULT
+    }
+
+    JSON_SCHEMA = {
+        '$schema': 'http://json-schema.org/draft-07/schema#',
+        'type': 'object',
+        'required': list(REQUIRED_FIELDS),
+        'additionalProperties': False,
+        'properties': {
+            'version': _NON_EMPTY_STRING,
+            'dls_settings': {
+                'type': 'object',
+                'default': DLS_SETTINGS_DEFAULT,
+                'additionalProperties': False,
+                'properties': {
+                    'log_filepath': dict(_NON_EMPTY_STRING,
+                                         default=LOG_FILEPATH_DEFAULT),
+                    'log_format': {
+                        'type': 'string',
+                        'enum': [CEF, JSON],
+                        'default': LOG_FORMAT_DEFAULT
+                    },
+                    'api': {
+                        'type': 'object',
+                        'default': API_DEFAULT,
+                        'additionalProperties': False,
+                        'properties': {
+                            'offset': {
+                                'type': 'number',
+                                'minimum': 0,
+                                'maximum': 180,
+                                'default': API_OFFSET_DEFAULT
+                            },
+                            'timeout': {
+                                'type': 'number',
+                                'default': API_TIMEOUT_DEFAULT
+                            }
+                        }
+                    },
+                    'checkpointing': {
+                        'type': 'object',
+                        'default': CHECKPOINTING_DEFAULT,
+                        'additionalProperties': False,
+                        'properties': {
+                            'enabled': {
+                                'type': 'boolean',
+                                'default': CHECKPOINTING_ENABLED_DEFAULT
+                            },
+                            'directory': dict(
+                                _NON_EMPTY_STRING,
+                                default=CHECKPOINTING_DIRECTORY_DEFAULT)
+                        }
+                    },
+                    'proxy': {
+                        'type': 'object',
+                        'default': PROXY_DEFAULT,
+                        'additionalProperties': False,
+                        'properties': {
+                            'proxy_server': {
+                                'type': 'string',
+                                'default': PROXY_SERVER_DEFAULT
+                            },
+                            'proxy_port': {
+                                'type': 'number',
+                                'default': PROXY_PORT_DEFAULT
+                            }
+                        }
+                    }
+                }
+            },
+            'servers': {
+                'type': 'array',
+                'minItems': 1,
+                'items': {
+                    'type': 'object',
+                    'required': ['id', 'hostname', 'port', 'protocol'],
+                    'additionalProperties': False,
+                    'properties': {
+                        'id': _NON_EMPTY_STRING,
+                        'hostname': _NON_EMPTY_STRING,
+                        'port': {
+                            'type': 'integer',
+                            'minimum': 0,
+                            'maximum': 65535
+                        },
+                        'protocol': {
+                            'type': 'string',
+                            'enum': ['TCPSSL', 'TCP', 'UDP']
+                        },
+                        'cert_filepath': _NON_EMPTY_STRING
+                    },
+                    # A TCPSSL server needs a certificate
+                    'if': {'properties': {'protocol': {'const': 'TCPSSL'}}},
+                    'then': {'required': ['cert_filepath']}
+                }
+            },
+            'account': {
+                'type': 'object',
+                'required': ['skey', 'ikey', 'hostname',
+                             'endpoint_server_mappings'],
+                'additionalProperties': False,
+                'properties': {
+                    'skey': _NON_EMPTY_STRING,
+                    'ikey': _NON_EMPTY_STRING,
+                    'hostname': _NON_EMPTY_STRING,
+                    'endpoint_server_mappings': {
+                        'type': 'array',
+                        'minItems': 1,
+                        'items': {
+                            'type': 'object',
+                            'required': ['server', 'endpoints'],
+                            'additionalProperties': False,
+                            'properties': {
+                                'server': _NON_EMPTY_STRING,
+                                'endpoints': {
+                                    'type': 'array',
+                                    'minItems': 1,
+                                    'items': {
+                                        'enum': sorted(VALID_ENDPOINTS)
+                                    }
+                                }
+                            }
+                        }
+                    },
+                    'is_msp': {'type': 'boolean', 'default': False},
+                    'block_list': {'type': 'array', 'default': []}
+                }
+            }
+        }
+    }
 
     # Private class variable, should not be accessed directly, only through
     # getter and setter methods
@@ -212,6 +426,23 @@ class Config:
     # Used to ensure that the _config variable is set once and only once
     _config_is_set = False
 
+    # Every value in _config keyed by the tuple of keys used to reach it, so
+    # that get_value is a single lookup. Rebuilt whenever _config is set.
+    # get_value accepts any path, so it cannot be served by _data alone
+    _flat = {}
+
+    # _ConfigData instance backing the getters, filled from _flat whenever
+    # _config is set. It only holds the fixed set of values the getters read
+    _data = None
+
+    # Function validating and normalizing a config dictionary, built on first
+    # use by _get_validator
+    _validator = None
+
+    # Validated and normalized configs read by create_config, keyed by the
+    # filepath, modification time and size of the file they were read from
+    _parsed_cache = {}
+
     @classmethod
     def _check_config_is_set(cls):
         """
@@ -227,6 +458,8 @@ class Config:
     def set_config(cls, config):
         """
         Function used to set the config of a Config object once and only once.
+        The values in config are resolved when it is set, so keys added,
+        replaced or removed in config afterwards are not seen by the getters.
 
         @param config   Dictionary used to set a Config object's 'config'
                         instance variable
@@ -237,6 +470,8 @@ class Config:
 
         cls._config = config
         cls._config_is_set = True
+        cls._flat = cls._flatten_config(config)
+        cls._data = _ConfigData(cls._flat)
 
     @classmethod
     def get_value(cls, keys):
@@ -245,96 +480,141 @@ class Config:
         """
 
         cls._check_config_is_set()
-        curr_value = cls._config
-        if curr_value:
-            for key in keys:
-                curr_value = curr_value.get(key)
+        if not cls._config:
+            return cls._config
 
-                if curr_value is None:
-                    raise ValueError(f"{key} is an invalid key for this Config")
+        try:
+            return cls._flat[tuple(keys)]
+        except KeyError:
+            raise ValueError(
+                f"{list(keys)} is an invalid key for this Config") from None
 
-        return curr_value
+    @staticmethod
+    def _flatten_config(config, prefix=()):
+        """
+        Walk a config dictionary once and map the path of keys leading to each
+        value (nested dictionaries included) to that value. None values are
+        left out since they are treated as missing keys.
+
+        @param config   Dictionary to flatten
+        @param prefix   Tuple of keys leading to config
+
+        @return dictionary of key tuples to values found in config
+        """
+
+        flat = {}
+
+        if not isinstance(config, dict):
+            return flat
+
+        for key, value in config.items():
+            if value is None:
+                continue
+
+            path = prefix + (key,)
+            flat[path] = value
+            flat.update(Config._flatten_config(value, path))
+
+        return flat
+
+    @classmethod
+    def _get_field(cls, name):
+        """
+        Getter for a value stored on the _ConfigData built from 'config'
+
+        @param name Name of a _ConfigData slot
+        """
+
+        cls._check_config_is_set()
+
+        try:
+            return getattr(cls._data, name)
+        except AttributeError:
+            if not cls._config:
+                return cls._config
+
+            raise ValueError(
+                f"{name} is not set for this Config") from None
 
     @classmethod
     def get_config_file_path(cls):
         """@return the filepath of the config file"""
-        return cls.get_value(['config_file_path'])
+        return cls._get_field('config_file_path')
 
     @classmethod
     def get_log_filepath(cls):
         """@return the filepath where DLS program messages should be saved"""
-        return cls.get_value(['dls_settings', 'log_filepath'])
+        return cls._get_field('log_filepath')
 
     @classmethod
     def get_log_format(cls):
         """@return how Duo logs should be formatted"""
-        return cls.get_value(['dls_settings', 'log_format'])
+        return cls._get_field('log_format')
 
     @classmethod
     def get_api_offset(cls):
         """@return the timestamp from which record retrieval should begin"""
-        return cls.get_value(['dls_settings', 'api', 'offset'])
+        return cls._get_field('api_offset')
 
     @classmethod
     def get_api_timeout(cls):
         """@return the seconds to wait between API calls"""
-        return cls.get_value(['dls_settings', 'api', 'timeout'])
+        return cls._get_field('api_timeout')
 
     @classmethod
     def get_checkpointing_enabled(cls):
         """@return whether checkpoint files should be used to recover offsets"""
-        return cls.get_value(['dls_settings', 'checkpointing', 'enabled'])
+        return cls._get_field('checkpointing_enabled')
 
     @classmethod
     def get_checkpoint_dir(cls):
         """@return the directory where checkpoint files should be stored"""
-        return cls.get_value(
-            ['dls_settings', 'checkpointing', 'directory'])
+        return cls._get_field('checkpoint_dir')
 
     @classmethod
     def get_servers(cls):
         """@return the list of servers to which Duo logs will be written"""
-        return cls.get_value(['servers'])
+        return cls._get_field('servers')
 
     @classmethod
     def get_account_ikey(cls):
         """@return the ikey of the account in config"""
-        return cls.get_value(['account', 'ikey'])
+        return cls._get_field('account_ikey')
 
     @classmethod
     def get_account_skey(cls):
         """@return the skey of the account in config"""
-        return cls.get_value(['account', 'skey'])
+        return cls._get_field('account_skey')
 
     @classmethod
     def get_account_hostname(cls):
         """@return the hostname of the account in config"""
-        return cls.get_value(['account', 'hostname'])
+        return cls._get_field('account_hostname')
 
     @classmethod
     def get_account_endpoint_server_mappings(cls):
         """@return the endpoint_server_mappings of the account in config"""
-        return cls.get_value(['account', 'endpoint_server_mappings'])
+        return cls._get_field('account_endpoint_server_mappings')
 
     @classmethod
     def get_account_block_list(cls):
         """@return the block_list of the account in config"""
-        return cls.get_value(['account', 'block_list'])
+        return cls._get_field('account_block_list')
 
     @classmethod
     def account_is_msp(cls):
         """@return whether the account in config is an MSP account"""
-        return cls.get_value(['account', 'is_msp'])
+        return cls._get_field('account_is_msp')
 
     @classmethod
     def get_proxy_server(cls):
         """@return the proxy_server in config"""
-        return cls.get_value(['dls_settings', 'proxy', 'proxy_server'])
+        return cls._get_field('proxy_server')
 
     @classmethod
     def get_proxy_port(cls):
         """@return the proxy_port in config"""
-        return cls.get_value(['dls_settings', 'proxy', 'proxy_port'])
+        return cls._get_field('proxy_port')
 
     @classmethod
     def create_config(cls, config_filepath):
@@ -345,21 +625,58 @@ class Config:
         @param config_filepath  File from which to generate a config object
         """
 
+        import yaml
+
+        # Prefer the libyaml-backed loader when PyYAML was built against
+        # libyaml, fall back to the pure-Python safe loader otherwise
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
         shutdown_reason = None
 
         try:
-            with open(config_filepath) as config_file:
-                # PyYAML gives better error messages for streams than for files
-                config_file_data = config_file.read()
-                config = yaml.full_load(config_file_data)
-
-                # Check config against a schema to ensure all the needed fields
-                # and values are defined
+            # Skip parsing and validation if this exact file was read before
+            config_stat = os.stat(config_filepath)
+            cache_key = (config_filepath, config_stat.st_mtime_ns,
+                         config_stat.st_size)
+            config = cls._parsed_cache.get(cache_key)
+
+            if config is None:
+                with open(config_filepath, 'rb',
+                          buffering=cls.CONFIG_READ_BUFFER_SIZE) as config_file:
+                    # Fail fast, without building the whole config, when a
+                    # required top-level field is absent (e.g. old configs)
+                    missing_fields = cls._find_missing_top_level_fields(
+                        config_file, loader)
+                    if missing_fields:
+                        raise ValueError(
+                            f"Missing required fields {missing_fields}")
+
+                    # Hand the file to PyYAML directly so it reads the bytes as
+                    # it parses instead of holding a decoded copy of the file
+                    config_file.seek(0)
+                    config = yaml.load(config_file, Loader=loader)
+
+                # The file is closed at this point. Check config against a
+                # schema to ensure all the needed fields and values are defined
                 config = cls._validate_and_normalize_config(config)
-                if config.get('dls_settings').get('api').get('timeout') < cls.API_TIMEOUT_DEFAULT:
-                    config['dls_settings']['api']['timeout'] = cls.API_TIMEOUT_DEFAULT
+
+                # Normalization guarantees the api settings exist
+                api = config['dls_settings']['api']
+                if api['timeout'] < cls.API_TIMEOUT_DEFAULT:
+                    api['timeout'] = cls.API_TIMEOUT_DEFAULT
                     Program.log(f'DuoLogSync: Setting default api timeout to {cls.API_TIMEOUT_DEFAULT} seconds.')
-                config['config_file_path'] = config_filepath
+
+                cls._parsed_cache[cache_key] = config
+
+            # Callers modify the config they are given, keep the cached copy
+            # untouched
+            config = copy.deepcopy(config)
+            api = config['dls_settings']['api']
+            config['config_file_path'] = config_filepath
+
+            # Calculate offset as a timestamp and rewrite its value in config
+            api['offset'] = int(time.time() - api['offset'] * SECONDS_PER_DAY)
+            return config
 
         # Will occur when given a bad filepath or a bad file
         except OSError as os_error:
@@ -368,45 +685,241 @@ class Config:
                         'that the filename is correct')
 
         # Will occur if the config file does not contain valid YAML
-        except YAMLError as yaml_error:
+        except yaml.YAMLError as yaml_error:
+            yaml_error = cls._describe_yaml_error(config_filepath, yaml_error)
             shutdown_reason = f"{yaml_error}"
             Program.log('DuoLogSync: Failed to parse the config file. Check '
                         'that the config file has valid YAML.')
 
         # Validation of the config against a schema failed
-        except ValueError:
-            shutdown_reason = f"{cls.SCHEMA_VALIDATOR.errors}"
+        except ValueError as value_error:
+            shutdown_reason = f"{value_error}"
             Program.log('DuoLogSync: Validation of the config file failed. '
                         'Check that required fields have proper values.')
 
-        # No exception raised during the try block, return config
-        else:
-            # Calculate offset as a timestamp and rewrite its value in config
-            offset = config.get('dls_settings').get('api').get('offset')
-            offset = datetime.now(timezone.utc) - timedelta(days=offset)
-            config['dls_settings']['api']['offset'] = int(offset.timestamp())
-            return config
-
         # At this point, it is guaranteed that an exception was raised, which
         # means that it is shutdown time
         Program.initiate_shutdown(shutdown_reason)
         return None
 
+    @staticmethod
+    def _describe_yaml_error(config_filepath, yaml_error):
+        """
+        Parse the config file again, as text and with the pure-Python loader,
+        to get an error that quotes the offending line. Neither the libyaml
+        loader nor a file stream give that snippet. Only used once parsing has
+        already failed
+
+        @param config_filepath  Config file that failed to parse
+        @param yaml_error       YAMLError raised while parsing the file
+
+        @return the YAMLError from parsing the file's text, or yaml_error if
+                that does not fail the same way
+        """
+
+        import yaml
+
+        try:
+            with open(config_filepath) as config_file:
+                config_file_data = config_file.read()
+        except (OSError, ValueError):
+            return yaml_error
+
+        loader = yaml.SafeLoader(config_file_data)
+        loader.name = config_filepath
+
+        try:
+            loader.get_single_data()
+        except yaml.YAMLError as text_yaml_error:
+            return text_yaml_error
+        finally:
+            loader.dispose()
+
+        return yaml_error
+
+    @classmethod
+    def _find_missing_top_level_fields(cls, config_file, loader):
+        """
+        Walk the YAML event stream of config_file, without constructing any
+        objects, to find which of REQUIRED_FIELDS are not keys of the top-level
+        mapping. Parsing stops as soon as every required field has been seen.
+
+        @param config_file  Open config file, positioned at its start
+        @param loader       PyYAML Loader class to parse config_file with
+
+        @return sorted list of the missing fields. Empty if none are missing,
+                if the document is not a mapping, or if a top-level key is a
+                merge key or an alias, since only a full load can tell which
+                keys those supply. Schema validation reports those cases
+        """
+
+        import yaml
+
+        missing_fields = set(cls.REQUIRED_FIELDS)
+        depth = 0
+
+        # Number of keys and values seen so far in the top-level mapping, keys
+        # are the even ones
+        top_level_nodes = 0
+
+        for event in yaml.parse(config_file, Loader=loader):
+            if isinstance(event, yaml.CollectionEndEvent):
+                depth -= 1
+
+                # End of the top-level mapping
+                if depth == 0:
+                    break
+
+                continue
+
+            # Only scalars, aliases and collection starts are nodes
+            if not isinstance(event, yaml.NodeEvent):
+                continue
+
+            if depth == 0 and not isinstance(event, yaml.MappingStartEvent):
+                return []
+
+            if depth == 1:
+                if top_level_nodes % 2 == 0:
+                    if isinstance(event, yaml.AliasEvent) or (
+                            isinstance(event, yaml.ScalarEvent)
+                            and event.value == '<<'):
+                        return []
+
+                    if isinstance(event, yaml.ScalarEvent):
+                        missing_fields.discard(event.value)
+
+                        if not missing_fields:
+                            break
+
+                top_level_nodes += 1
+
+            if isinstance(event, yaml.CollectionStartEvent):
+                depth += 1
+
+        return sorted(missing_fields)
+
     @classmethod
     def _validate_and_normalize_config(cls, config):
         """
-        Use a schema and the cerberus library to validate that the given config
-        dictionary has a valid structure
+        Use a schema to validate that the given config dictionary has a valid
+        structure and fill in defaults for optional fields
 
         @param config   Dictionary for which to validate the structure
+
+        @return the normalized config
+        """
+
+        return cls._get_validator()(config)
+
+    @classmethod
+    def _get_validator(cls):
+        """
+        Build the function used to validate and normalize a config the first
+        time it is needed. The compiled JSON Schema is used when fastjsonschema
+        is installed, cerberus otherwise
+
+        @return function taking a config dictionary and returning it normalized,
+                raising ValueError describing the problem if it is invalid
+        """
+
+        if cls._validator is None:
+            cls._validator = (cls._build_json_schema_validator()
+                              or cls._build_cerberus_validator())
+
+        return cls._validator
+
+    @classmethod
+    def _build_json_schema_validator(cls):
         """
+        @return a validation function compiled from JSON_SCHEMA, or None if
+                fastjsonschema is not installed
+        """
+
+        try:
+            import fastjsonschema  # type: ignore
+        except ImportError:
+            return None
+
+        compiled_validator = fastjsonschema.compile(cls.JSON_SCHEMA)
+
+        def validate(config):
+            cls._prepare_for_json_schema(config, cls.JSON_SCHEMA)
+
+            try:
+                return compiled_validator(config)
+            except fastjsonschema.JsonSchemaException as schema_error:
+                raise ValueError(schema_error.message) from schema_error
+
+        return validate
+
+    @classmethod
+    def _prepare_for_json_schema(cls, value, schema, path='data'):
+        """
+        Make value behave under JSON_SCHEMA the way it does under SCHEMA, for
+        the cases JSON Schema cannot express. Null values of fields with a
+        default are removed so that the default is filled in, as cerberus
+        does, and floats are rejected for integer fields, which JSON Schema
+        accepts when they have no fractional part. value is modified in place
+
+        @param value    Part of a config dictionary to prepare
+        @param schema   Part of JSON_SCHEMA describing value
+        @param path     Location of value, used in error messages
+        """
+
+        schema_type = schema.get('type')
+
+        if schema_type == 'integer' and isinstance(value, float):
+            raise ValueError(f"{path} must be integer")
+
+        if schema_type == 'object' and isinstance(value, dict):
+            properties = schema.get('properties', {})
+
+            for key in list(value):
+                field_schema = properties.get(key)
+                if field_schema is None:
+                    continue
+
+                if value[key] is None and 'default' in field_schema:
+                    del value[key]
+                else:
+                    cls._prepare_for_json_schema(
+                        value[key], field_schema, f"{path}.{key}")
+
+        elif schema_type == 'array' and isinstance(value, list):
+            item_schema = schema.get('items', {})
+
+            for index, item in enumerate(value):
+                cls._prepare_for_json_schema(
+                    item, item_schema, f"{path}[{index}]")
+
+    @classmethod
+    def _build_cerberus_validator(cls):
+        """
+        @return a validation function using a cerberus Validator for SCHEMA
+        """
+
+        from cerberus import Validator, schema_registry  # type: ignore
+
+        schema_registry.add('server', cls.SERVER)
+        schema_registry.add('endpoint_server_mapping',
+                            cls.ENDPOINT_SERVER_MAPPING)
+        schema_validator = Validator(cls.SCHEMA)
+
+        def validate(config):
+            # cerberus raises its own DocumentError for these
+            if not isinstance(config, dict):
+                raise ValueError('config must be a mapping')
+
+            # Config is not a valid structure
+            if not schema_validator.validate(config):
+                raise ValueError(schema_validator.errors)
 
-        # Config is not a valid structure
-        if not cls.SCHEMA_VALIDATOR.validate(config):
-            raise ValueError
+            # validate() already normalized a copy of config, so reuse it
+            # rather than running a second normalization pass
+            return schema_validator.document
 
-        config = cls.SCHEMA_VALIDATOR.normalized(config)
-        return config
+        return validate
 
     @staticmethod
     def get_value_from_keys(dictionary, keys):
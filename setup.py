@@ -19,6 +19,7 @@ setup(
     packages=find_packages(exclude=['tests']),
     python_requires=">=3.6.2",
     install_requires=["duo_client==4.7.1", "PyYAML==6.0.1", "Cerberus==1.3.2", "six==1.15.0"],
+    extras_require={"fast": ["fastjsonschema>=2.15"]},
     entry_points={
         "console_scripts": ["duologsync = duologsync.app:main"],
     },
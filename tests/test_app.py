@@ -13,6 +13,8 @@ class TestApp(TestCase):
     def tearDown(self):
         Config._config = None
         Config._config_is_set = False
+        Config._flat = {}
+        Config._data = None
         Program._running = True
 
     @patch("duologsync.app.create_admin", return_value="duo_admin")
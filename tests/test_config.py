@@ -2,6 +2,10 @@ from unittest import TestCase
 from unittest.mock import patch
 import os
 import sys
+import copy
+import glob
+import time
+import yaml
 from yaml import YAMLError
 from duologsync.config import Config
 from duologsync.program import Program
@@ -13,6 +17,9 @@ class TestConfig(TestCase):
     def tearDown(self):
         Config._config = None
         Config._config_is_set = False
+        Config._flat = {}
+        Config._data = None
+        Config._parsed_cache = {}
         Program._running = True
 
     def test_set_config_normal(self):
@@ -41,6 +48,16 @@ class TestConfig(TestCase):
         self.assertEqual(value_one, True)
         self.assertEqual(value_two, 100)
 
+    def test_get_value_resolved_when_config_is_set(self):
+        config = {'field_one': {'nested_field': True}, 'field_two': 100}
+
+        Config.set_config(config)
+        Config.get_value(['field_one', 'nested_field'])
+        config['field_one']['nested_field'] = False
+        value = Config.get_value(['field_one', 'nested_field'])
+
+        self.assertEqual(value, True)
+
     def test_get_value_before_setting_config(self):
         config = {'field_one': {'nested_field': True}, 'field_two': 100}
 
@@ -55,6 +72,26 @@ class TestConfig(TestCase):
         with self.assertRaises(ValueError):
             Config.get_value(['house_key', 'car_key'])
 
+    def test_getter_before_setting_config(self):
+        with self.assertRaises(RuntimeError):
+            Config.get_account_ikey()
+
+    def test_getter_after_config_is_unset(self):
+        Config.set_config({'account': {'ikey': 'ASDFF'}})
+        Config._config = None
+        Config._config_is_set = False
+
+        with self.assertRaises(RuntimeError):
+            Config.get_account_ikey()
+
+    def test_getter_with_missing_value(self):
+        config = {'account': {'ikey': 'ASDFF'}}
+
+        Config.set_config(config)
+
+        with self.assertRaises(ValueError):
+            Config.get_account_skey()
+
     def test_get_log_filepath(self):
         config = {'dls_settings': {'log_filepath': '/dev/null'}}
 
@@ -203,6 +240,27 @@ class TestConfig(TestCase):
 
         self.assertEqual(correct_config, config)
 
+    def test_create_config_unchanged_file_is_not_parsed_again(self):
+        config_filepath = 'tests/resources/config_files/standard.yml'
+
+        config_one = Config.create_config(config_filepath)
+        config_one['account']['ikey'] = 'CHANGED'
+
+        with patch('yaml.load') as mock_load:
+            config_two = Config.create_config(config_filepath)
+
+        mock_load.assert_not_called()
+        self.assertEqual(config_two['account']['ikey'], 'AAA101020K12K1K23')
+
+    def test_create_config_offset_is_timestamp(self):
+        config_filepath = 'tests/resources/config_files/standard.yml'
+
+        expected_offset = int(time.time()) - 180 * 24 * 60 * 60
+        config = Config.create_config(config_filepath)
+
+        self.assertAlmostEqual(config['dls_settings']['api']['offset'],
+                               expected_offset, delta=5)
+
     @patch('duologsync.program.Program.initiate_shutdown')
     def test_create_config_bad_filepath(self, mock_initiate_shutdown):
         config_filepath = 'absolute/nonsense/this/goes/nowhere.yml'
@@ -219,6 +277,17 @@ class TestConfig(TestCase):
 
         mock_initiate_shutdown.assert_called_once()
 
+    @patch('duologsync.program.Program.initiate_shutdown')
+    def test_create_config_invalid_yaml_quotes_line(self,
+                                                   mock_initiate_shutdown):
+        config_filepath = 'tests/resources/config_files/bad_yaml.yml'
+
+        Config.create_config(config_filepath)
+
+        shutdown_reason = mock_initiate_shutdown.call_args[0][0]
+        self.assertIn(config_filepath, shutdown_reason)
+        self.assertIn('5%/?\n      ^', shutdown_reason)
+
     @patch('duologsync.program.Program.initiate_shutdown',
            side_effect=running_is_false)
     def test_create_config_invalid_config(self, mock_initiate_shutdown):
@@ -228,6 +297,26 @@ class TestConfig(TestCase):
         
         mock_initiate_shutdown.assert_called_once()
 
+    @patch('duologsync.program.Program.initiate_shutdown',
+           side_effect=running_is_false)
+    def test_create_config_missing_top_level_fields(self,
+                                                    mock_initiate_shutdown):
+        config_filepath = 'tests/resources/config_files/bad_config.yml'
+
+        with patch('yaml.load') as mock_load:
+            Config.create_config(config_filepath)
+
+        mock_load.assert_not_called()
+        mock_initiate_shutdown.assert_called_once_with(
+            "Missing required fields ['account', 'servers', 'version']")
+
+    def test_create_config_top_level_merge_key(self):
+        config_filepath = 'tests/resources/config_files/merge_key.yml'
+
+        config = Config.create_config(config_filepath)
+
+        self.assertEqual(config['version'], '1.0.0')
+
     @patch('duologsync.program.Program.initiate_shutdown',
            side_effect=running_is_false)
     def test_create_config_with_bad_values(self, mock_initiate_shutdown):
@@ -253,6 +342,73 @@ class TestConfig(TestCase):
         self.assertNotEqual(config['account']['is_msp'], None)
         self.assertNotEqual(config['account']['block_list'], None)
 
+    def test_create_config_cerberus_fallback(self):
+        config_filepath = 'tests/resources/config_files/no_defaults_set.yml'
+
+        config = Config.create_config(config_filepath)
+        Config._parsed_cache = {}
+
+        with patch.object(Config, '_build_json_schema_validator',
+                          return_value=None), \
+                patch.object(Config, '_validator', None):
+            fallback_config = Config.create_config(config_filepath)
+
+        config['dls_settings']['api']['offset'] = 180
+        fallback_config['dls_settings']['api']['offset'] = 180
+        self.assertEqual(config, fallback_config)
+
+    def test_json_schema_and_cerberus_agree(self):
+        json_schema_validate = Config._build_json_schema_validator()
+        if json_schema_validate is None:
+            self.skipTest('fastjsonschema is not installed')
+
+        cerberus_validate = Config._build_cerberus_validator()
+
+        configs = {}
+        for config_filepath in sorted(
+                glob.glob('tests/resources/config_files/*.yml')):
+            try:
+                with open(config_filepath) as config_file:
+                    configs[config_filepath] = yaml.safe_load(config_file)
+            except YAMLError:
+                continue
+
+        standard = configs['tests/resources/config_files/standard.yml']
+
+        def variant(*keys, value):
+            config = copy.deepcopy(standard)
+            parent = config
+            for key in keys[:-1]:
+                parent = parent[key]
+            parent[keys[-1]] = value
+            return config
+
+        configs.update({
+            'empty dls_settings': variant('dls_settings', value=None),
+            'empty api': variant('dls_settings', 'api', value=None),
+            'empty offset': variant('dls_settings', 'api', 'offset',
+                                    value=None),
+            'empty block_list': variant('account', 'block_list', value=None),
+            'empty is_msp': variant('account', 'is_msp', value=None),
+            'empty version': variant('version', value=None),
+            'empty cert_filepath': variant('servers', 0, 'cert_filepath',
+                                           value=None),
+            'float port': variant('servers', 0, 'port', value=8888.0),
+            'boolean port': variant('servers', 0, 'port', value=True),
+            'empty document': None
+        })
+
+        for name, config in configs.items():
+            with self.subTest(config=name):
+                outcomes = []
+                for validate in (json_schema_validate, cerberus_validate):
+                    try:
+                        outcomes.append(validate(copy.deepcopy(config)))
+                    except ValueError:
+                        outcomes.append(ValueError)
+
+                self.assertEqual(outcomes[0], outcomes[1])
+
     def test_get_value_from_keys_normal(self):
         dictionary = {'level_one': '2FA',
                       'access_device': {'ip': '192.168.0.1'}}
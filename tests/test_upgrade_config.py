@@ -0,0 +1,13 @@
+from unittest import TestCase
+from duologsync.config import Config
+from upgrade_config import upgrade_config
+
+class TestUpgradeConfig(TestCase):
+    def test_upgrade_config_single_endpoint(self):
+        config_filepath = 'tests/resources/old_config_files/single_endpoint.yml'
+
+        config = upgrade_config(config_filepath)
+        endpoints = config['account']['endpoint_server_mappings'][0]['endpoints']
+
+        self.assertEqual(endpoints, ['auth'])
+        Config._get_validator()(config)
@@ -52,6 +52,10 @@ CONFIG_CHANGESET = {
         EDIT: {
             ('version',): (lambda _ : '1.0.0'),
             ('dls_settings', 'api', 'timeout'): (lambda timeout : timeout * 60),
+            # Old configs allowed a single endpoint as a plain string
+            ('account', 'endpoint_server_mappings', 0, 'endpoints'): (
+                lambda endpoints : [endpoints]
+                if isinstance(endpoints, str) else endpoints),
         },
         DELETE: [
             ('dls_settings', 'endpoints'),